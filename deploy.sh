@@ -52,6 +52,7 @@ gcloud run deploy ${SERVICE_NAME} \
     --allow-unauthenticated \
     --memory 512Mi \
     --cpu 1 \
+    --concurrency 8 \
     --timeout 300 \
     --max-instances 10
 
@@ -0,0 +1,13 @@
+from uvicorn.workers import UvicornWorker
+
+from main import SERVER_LIMIT_CONCURRENCY
+
+
+class LimitedUvicornWorker(UvicornWorker):
+    # gunicorn has no flag for uvicorn's limit_concurrency, so the Dockerfile
+    # uses this worker class to shed connections beyond the limit with a 503.
+    # It lives outside main.py so importing the app does not require gunicorn.
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "limit_concurrency": SERVER_LIMIT_CONCURRENCY,
+    }
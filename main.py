@@ -1,13 +1,23 @@
+import asyncio
+import hashlib
+import io
+import itertools
 import logging
 import os
+import threading
 import time
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Optional
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import ORJSONResponse, Response
 from google.cloud import vision
+from PIL import Image as PILImage
+from PIL import ImageFilter, ImageOps
 from pydantic import BaseModel
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,11 +25,67 @@ logger = logging.getLogger(__name__)
 
 # Constants
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-ALLOWED_CONTENT_TYPES = ["image/jpeg", "image/jpg"]
-ALLOWED_EXTENSIONS = [".jpg", ".jpeg"]
+MULTIPART_OVERHEAD_BYTES = 4096  # Allowance for boundaries and part headers
+MAX_REQUEST_SIZE = MAX_FILE_SIZE + MULTIPART_OVERHEAD_BYTES
+ALLOWED_CONTENT_TYPES = frozenset({"image/jpeg", "image/jpg"})
+ALLOWED_EXTENSIONS = (".jpg", ".jpeg")  # Tuple so str.endswith can take it
+JPEG_SIGNATURE = b"\xff\xd8\xff"  # JPEG SOI marker plus the next marker byte
+# Sized for a 512Mi Cloud Run instance: a worst-case request holds ~40MB
+# (10MB upload, its decoded image and the re-encoded payload) on top of
+# ~150MB for the process. deploy.sh caps Cloud Run at 8 requests per
+# instance; the connection limit leaves 2 slots for idle keep-alive
+# connections from the front end, which uvicorn also counts.
+RAW_BODY_READ_CONCURRENCY = 8  # Raw request bodies streamed at once
+SERVER_LIMIT_CONCURRENCY = 10  # Connections beyond this get a 503
+SERVER_BACKLOG = 128
+SERVER_KEEP_ALIVE_SECONDS = 5
+MAX_IMAGE_DIMENSION = 1920  # Longest edge sent to Vision API, in pixels
+JPEG_REENCODE_QUALITY = 85
+OCR_TILE_SIZE = 512  # Edge of the square tiles used by segmented OCR
+TEXT_SCREEN_DIMENSION = 960  # Long edge used by the text pre-screen
+TEXT_EDGE_STRENGTH = 32  # Minimum edge filter response counted as an edge
+MIN_TEXT_EDGE_PIXELS = 16  # Fewer strong edges than this means no text
+VISION_CHANNEL_POOL_SIZE = 4
+VISION_BATCH_MAX_IMAGES = 16  # Vision API limit per batch_annotate_images
+VISION_BATCH_MAX_BYTES = 8 * 1024 * 1024  # 8MB of image content per batch
+VISION_BATCH_WINDOW_SECONDS = 0.01  # How long a batch waits for more images
+OCR_CACHE_MAX_ENTRIES = 1024
+OCR_CACHE_TTL_SECONDS = 3600
+OCR_CACHE_NEGATIVE_TTL_SECONDS = 300  # For "no text found" results
+
+# Errors Pillow raises for images it cannot or will not decode;
+# DecompressionBombError is not an OSError
+IMAGE_DECODE_ERRORS = (OSError, PILImage.DecompressionBombError)
+
+# Global Vision API clients (initialized in lifespan). Each pooled client owns
+# its own gRPC channel; vision_client is the first of them.
+vision_client: Optional[vision.ImageAnnotatorAsyncClient] = None
+vision_client_pool: list[vision.ImageAnnotatorAsyncClient] = []
+_vision_client_cursor = itertools.count()
+
+# Micro-batching of concurrent OCR requests into batch_annotate_images RPCs
+# (queue and worker task are started in lifespan)
+_vision_batch_queue: Optional[asyncio.Queue] = None
+_vision_batch_task: Optional[asyncio.Task] = None
+_vision_batch_dispatches: set[asyncio.Task] = set()
+
+# Bounds how many raw request bodies are streamed concurrently. Multipart
+# uploads need no slot: Starlette has spooled them before the endpoint runs.
+_raw_body_read_semaphore = asyncio.Semaphore(RAW_BODY_READ_CONCURRENCY)
+
+# OCR results for previously seen uploads, so repeated images skip the Vision
+# API round trip. Keyed by the SHA256 digest of the upload; each entry is
+# ((text, confidence), stored_at) so "no text found" results expire sooner.
+OcrCacheEntry = tuple[tuple[str, float], float]
+_OCR_CACHE: TTLCache[bytes, OcrCacheEntry] = TTLCache(
+    maxsize=OCR_CACHE_MAX_ENTRIES, ttl=OCR_CACHE_TTL_SECONDS
+)
+_OCR_CACHE_LOCK = threading.Lock()
 
-# Global Vision API client (initialized in lifespan)
-vision_client: Optional[vision.ImageAnnotatorClient] = None
+# Text pre-screen counters, used to log how often uploads are promoted to
+# the Vision API
+_text_screen_stats = {"screened": 0, "promoted": 0}
+_TEXT_SCREEN_LOCK = threading.Lock()
 
 
 # --- Pydantic Response Models ---
@@ -62,20 +128,77 @@ class HealthResponseModel(BaseModel):
 # --- Lifespan ---
 
 
+def create_vision_client() -> vision.ImageAnnotatorAsyncClient:
+    transport_class = vision.ImageAnnotatorAsyncClient.get_transport_class(
+        "grpc_asyncio"
+    )
+    channel = transport_class.create_channel(
+        options=[
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+            # Give each channel its own subchannel (and TCP connection)
+            # instead of sharing the process-wide subchannel pool
+            ("grpc.use_local_subchannel_pool", 1),
+        ],
+    )
+    return vision.ImageAnnotatorAsyncClient(
+        transport=transport_class(channel=channel),
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global vision_client
-
+    global vision_client, vision_client_pool
+    global _vision_batch_queue, _vision_batch_task
+
+    # Clients are created here, in each worker after fork: gRPC channels
+    # cannot be shared across fork and asyncio channels are bound to the
+    # worker's event loop. The gunicorn master imports this module before
+    # fork anyway (gunicorn_worker imports it), so module-level state must
+    # stay free of clients and channels.
     try:
-        vision_client = vision.ImageAnnotatorClient()
-        logger.info("Vision API client initialized successfully")
+        vision_client_pool = [
+            create_vision_client() for _ in range(VISION_CHANNEL_POOL_SIZE)
+        ]
+        vision_client = vision_client_pool[0]
+        logger.info(
+            f"Vision API client pool initialized with "
+            f"{VISION_CHANNEL_POOL_SIZE} channels"
+        )
     except Exception as e:
         logger.error(f"Failed to initialize Vision API client: {e}")
         vision_client = None
+        vision_client_pool = []
+
+    if vision_client is not None:
+        _vision_batch_queue = asyncio.Queue()
+        _vision_batch_task = asyncio.create_task(
+            run_vision_batcher(_vision_batch_queue)
+        )
 
     yield
 
     logger.info("Application shutting down")
+    if _vision_batch_task is not None:
+        _vision_batch_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await _vision_batch_task
+
+        # Fail requests still queued, then let in-flight batches finish
+        # before their channels are closed
+        queued = []
+        while not _vision_batch_queue.empty():
+            queued.append(_vision_batch_queue.get_nowait())
+        fail_vision_requests(queued, vision_unavailable_error())
+        await asyncio.gather(*_vision_batch_dispatches, return_exceptions=True)
+
+        _vision_batch_queue = None
+        _vision_batch_task = None
+
+    for client in vision_client_pool:
+        await client.transport.close()
+    vision_client = None
+    vision_client_pool = []
 
 
 # --- App ---
@@ -85,12 +208,32 @@ app = FastAPI(
     description="Extract text from JPG images using Google Cloud Vision API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
 # --- Helper Functions ---
 
 
+# The 413 payload is constant, so it is serialized once at import
+_PAYLOAD_TOO_LARGE_BYTES = orjson.dumps(
+    ErrorResponseModel(
+        success=False,
+        error="Payload too large",
+        detail="File size exceeds 10MB limit",
+        processing_time_ms=0,
+    ).model_dump()
+)
+
+
+def payload_too_large_response() -> Response:
+    return Response(
+        content=_PAYLOAD_TOO_LARGE_BYTES,
+        status_code=413,
+        media_type="application/json",
+    )
+
+
 def validate_image(file: UploadFile) -> None:
     if file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(
@@ -107,8 +250,8 @@ def validate_image(file: UploadFile) -> None:
             detail="Filename is required",
         )
 
-    extension = os.path.splitext(file.filename)[1].lower()
-    if extension not in ALLOWED_EXTENSIONS:
+    if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
+        extension = os.path.splitext(file.filename)[1].lower()
         raise HTTPException(
             status_code=400,
             detail=(
@@ -118,7 +261,311 @@ def validate_image(file: UploadFile) -> None:
         )
 
 
-def extract_text_from_image(image_content: bytes) -> tuple[str, float]:
+def has_jpeg_signature(content: bytes) -> bool:
+    return content.startswith(JPEG_SIGNATURE)
+
+
+def get_vision_client() -> Optional[vision.ImageAnnotatorAsyncClient]:
+    # Round-robin across the pooled channels so concurrent RPCs are spread
+    # over several HTTP/2 connections
+    if not vision_client_pool:
+        return vision_client
+    index = next(_vision_client_cursor) % len(vision_client_pool)
+    return vision_client_pool[index]
+
+
+def vision_unavailable_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Vision API service unavailable",
+    )
+
+
+def fail_vision_requests(
+    items: list[tuple[bytes, asyncio.Future]], error: Exception
+) -> None:
+    for _, future in items:
+        if not future.done():
+            future.set_exception(error)
+
+
+async def dispatch_vision_batch(
+    batch: list[tuple[bytes, asyncio.Future]],
+) -> None:
+    requests = [
+        vision.AnnotateImageRequest(
+            image=vision.Image(content=payload),
+            features=[
+                vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)
+            ],
+        )
+        for payload, _ in batch
+    ]
+
+    try:
+        response = await get_vision_client().batch_annotate_images(
+            requests=requests
+        )
+    except Exception as e:
+        logger.error(f"Vision API batch request failed: {e}")
+        fail_vision_requests(batch, e)
+        return
+
+    for (_, future), image_response in zip(batch, response.responses):
+        if not future.done():
+            future.set_result(image_response)
+
+    # Guard clause: never leave a caller waiting on a missing response
+    if len(response.responses) < len(batch):
+        logger.error(
+            f"Vision API returned {len(response.responses)} responses "
+            f"for a batch of {len(batch)} images"
+        )
+        fail_vision_requests(
+            batch,
+            HTTPException(
+                status_code=500,
+                detail="Failed to process image with Vision API",
+            ),
+        )
+
+
+async def run_vision_batcher(queue: asyncio.Queue) -> None:
+    # Collect requests that arrive within VISION_BATCH_WINDOW_SECONDS of the
+    # first one and send them as a single RPC. An item that would push the
+    # batch over VISION_BATCH_MAX_BYTES is carried over to the next batch.
+    carried_item: Optional[tuple[bytes, asyncio.Future]] = None
+    batch: list[tuple[bytes, asyncio.Future]] = []
+
+    try:
+        while True:
+            first_item = carried_item or await queue.get()
+            carried_item = None
+            batch = [first_item]
+            await asyncio.sleep(VISION_BATCH_WINDOW_SECONDS)
+
+            batch_bytes = len(first_item[0])
+            while len(batch) < VISION_BATCH_MAX_IMAGES and not queue.empty():
+                item = queue.get_nowait()
+                if batch_bytes + len(item[0]) > VISION_BATCH_MAX_BYTES:
+                    carried_item = item
+                    break
+                batch.append(item)
+                batch_bytes += len(item[0])
+
+            # Dispatch without awaiting so the next batch can start
+            # collecting while this RPC is in flight
+            task = asyncio.create_task(dispatch_vision_batch(batch))
+            _vision_batch_dispatches.add(task)
+            task.add_done_callback(_vision_batch_dispatches.discard)
+            batch = []
+    finally:
+        # On shutdown, fail whatever was collected but not yet dispatched
+        undispatched = batch + ([carried_item] if carried_item else [])
+        fail_vision_requests(undispatched, vision_unavailable_error())
+
+
+async def annotate_image(payload: bytes) -> vision.AnnotateImageResponse:
+    # Without a running batcher, fall back to a direct single-image RPC
+    if _vision_batch_queue is None:
+        image = vision.Image(content=payload)
+        return await get_vision_client().text_detection(image=image)
+
+    future = asyncio.get_running_loop().create_future()
+    await _vision_batch_queue.put((payload, future))
+    return await future
+
+
+async def read_request_body(request: Request) -> bytes:
+    # Stream a raw request body, rejecting it as soon as it passes the limit
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail="File too large. Maximum size is 10MB",
+            )
+
+    return bytes(body)
+
+
+async def read_upload(file: UploadFile) -> bytes:
+    # Starlette has already spooled the part and recorded its size, so an
+    # oversized file is rejected before its content is read into memory
+    file_size = file.size
+    if file_size is None:
+        file_size = file.file.seek(0, os.SEEK_END)
+        await file.seek(0)
+
+    if file_size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail="File too large. Maximum size is 10MB",
+        )
+
+    return await file.read()
+
+
+def decode_image(
+    image_content: bytes,
+) -> Optional[tuple[PILImage.Image, bool]]:
+    # Decode once at no more than MAX_IMAGE_DIMENSION on the long edge, for
+    # both the text pre-screen and the downscale. Returns the image and
+    # whether it was downscaled, or None if Pillow cannot decode it.
+    try:
+        image = PILImage.open(io.BytesIO(image_content))
+        is_downscaled = max(image.size) > MAX_IMAGE_DIMENSION
+
+        # Let the JPEG decoder skip DCT detail we are about to discard
+        image.draft("RGB", (MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(
+            (MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION), PILImage.LANCZOS
+        )
+        image.load()
+    except IMAGE_DECODE_ERRORS as e:
+        logger.warning(f"Could not decode image, sending as-is: {e}")
+        return None
+
+    return image, is_downscaled
+
+
+def has_text_signal(image: PILImage.Image) -> bool:
+    # Cheap stage-one check: count strong edges on a small grayscale copy.
+    # Blank and near-uniform images have almost none.
+    gray = image.convert("L")
+    gray.thumbnail((TEXT_SCREEN_DIMENSION, TEXT_SCREEN_DIMENSION))
+    edges = gray.filter(ImageFilter.FIND_EDGES)
+
+    # FIND_EDGES copies border pixels through unfiltered, so drop them
+    edges = edges.crop((1, 1, edges.width - 1, edges.height - 1))
+    strong_edge_pixels = sum(edges.histogram()[TEXT_EDGE_STRENGTH:])
+    return strong_edge_pixels >= MIN_TEXT_EDGE_PIXELS
+
+
+def record_text_screen(is_promoted: bool) -> None:
+    with _TEXT_SCREEN_LOCK:
+        _text_screen_stats["screened"] += 1
+        if is_promoted:
+            _text_screen_stats["promoted"] += 1
+
+        screened = _text_screen_stats["screened"]
+        promoted = _text_screen_stats["promoted"]
+    logger.info(
+        f"Text pre-screen promoted {promoted}/{screened} images "
+        f"to Vision API ({promoted / screened:.1%})"
+    )
+
+
+def shrink_image(image_content: bytes, image: PILImage.Image) -> bytes:
+    # Re-encode a downscaled image for Vision API, keeping the original
+    # bytes if the re-encode fails or comes out no smaller
+    try:
+        output = io.BytesIO()
+        image.save(
+            output, "JPEG", quality=JPEG_REENCODE_QUALITY, optimize=True
+        )
+    except OSError as e:
+        logger.warning(f"Could not downscale image, sending as-is: {e}")
+        return image_content
+
+    shrunk_content = output.getvalue()
+    if len(shrunk_content) >= len(image_content):
+        return image_content
+
+    return shrunk_content
+
+
+def split_into_tiles(image_content: bytes) -> list[bytes]:
+    # Cut the decoded (downscaled) image into OCR_TILE_SIZE squares in
+    # row-major tile order, each re-encoded as its own JPEG so identical
+    # regions produce identical bytes. Returns an empty list if Pillow
+    # cannot decode the image.
+    decoded = decode_image(image_content)
+    if decoded is None:
+        return []
+
+    image, _ = decoded
+    tiles = []
+    for top in range(0, image.height, OCR_TILE_SIZE):
+        for left in range(0, image.width, OCR_TILE_SIZE):
+            right = min(left + OCR_TILE_SIZE, image.width)
+            bottom = min(top + OCR_TILE_SIZE, image.height)
+            tile = image.crop((left, top, right, bottom))
+            output = io.BytesIO()
+            tile.save(output, "JPEG", quality=JPEG_REENCODE_QUALITY)
+            tiles.append(output.getvalue())
+
+    return tiles
+
+
+def is_cache_entry_fresh(entry: OcrCacheEntry) -> bool:
+    (_, confidence), stored_at = entry
+    ttl = (
+        OCR_CACHE_NEGATIVE_TTL_SECONDS
+        if confidence == 0.0
+        else OCR_CACHE_TTL_SECONDS
+    )
+    return time.monotonic() - stored_at < ttl
+
+
+def get_ocr_cache_key(image_content: bytes) -> bytes:
+    return hashlib.sha256(image_content).digest()
+
+
+def get_cached_text(cache_key: bytes) -> Optional[tuple[str, float]]:
+    with _OCR_CACHE_LOCK:
+        entry = _OCR_CACHE.get(cache_key)
+
+    if entry is None or not is_cache_entry_fresh(entry):
+        return None
+
+    return entry[0]
+
+
+def store_cached_text(cache_key: bytes, result: tuple[str, float]) -> None:
+    with _OCR_CACHE_LOCK:
+        _OCR_CACHE[cache_key] = (result, time.monotonic())
+
+
+def preprocess_image(
+    image_content: bytes, record_screen: bool = True
+) -> tuple[bytes, Optional[tuple[str, float]], Optional[bytes]]:
+    # CPU-bound path run in a worker thread: hashing, cache probe, text
+    # pre-screen and downscaling. Returns (cache_key, result, None) when no
+    # Vision API call is needed, otherwise (cache_key, None, payload) with
+    # the bytes to send. The cache key is hashed once here and reused to
+    # store the Vision API result. Images Pillow cannot decode are sent
+    # as-is for Vision API to judge. Tiles of a segmented upload pass
+    # record_screen=False so the promotion rate counts uploads, not tiles.
+    cache_key = get_ocr_cache_key(image_content)
+    cached_result = get_cached_text(cache_key)
+    if cached_result is not None:
+        return cache_key, cached_result, None
+
+    decoded = decode_image(image_content)
+    if decoded is None:
+        if record_screen:
+            record_text_screen(True)
+        return cache_key, None, image_content
+
+    image, is_downscaled = decoded
+    is_text_likely = has_text_signal(image)
+    if record_screen:
+        record_text_screen(is_text_likely)
+    if not is_text_likely:
+        return cache_key, ("", 0.0), None
+
+    if not is_downscaled:
+        return cache_key, None, image_content
+
+    return cache_key, None, shrink_image(image_content, image)
+
+
+async def extract_text_from_image(
+    image_content: bytes, record_screen: bool = True
+) -> tuple[str, float]:
     if vision_client is None:
         logger.error("Vision API client not initialized")
         raise HTTPException(
@@ -132,8 +579,13 @@ def extract_text_from_image(image_content: bytes) -> tuple[str, float]:
             detail="Empty image content",
         )
 
-    image = vision.Image(content=image_content)
-    response = vision_client.text_detection(image=image)
+    cache_key, result, payload = await asyncio.to_thread(
+        preprocess_image, image_content, record_screen
+    )
+    if result is not None:
+        return result
+
+    response = await annotate_image(payload)
 
     if response.error.message:
         logger.error(f"Vision API error: {response.error.message}")
@@ -143,83 +595,212 @@ def extract_text_from_image(image_content: bytes) -> tuple[str, float]:
         )
 
     texts = response.text_annotations
+    extracted_text = texts[0].description if texts else ""
+    confidence = 0.95 if extracted_text else 0.0
+
+    store_cached_text(cache_key, (extracted_text, confidence))
+
+    return extracted_text, confidence
+
 
-    if not texts:
-        return "", 0.0
+async def extract_text_from_tiles(image_content: bytes) -> tuple[str, float]:
+    # Segment-level OCR: each tile goes through the regular cache, text
+    # pre-screen and batcher, so recurring regions are only sent to Vision
+    # API once and the cache misses of one image share batched RPCs. Tile
+    # texts are joined in tile order, not reading order: a line crossing a
+    # tile boundary comes back as separate fragments.
+    tiles = await asyncio.to_thread(split_into_tiles, image_content)
+    if not tiles:
+        return await extract_text_from_image(image_content)
 
-    extracted_text = texts[0].description
+    tile_results = await asyncio.gather(
+        *(extract_text_from_image(tile, record_screen=False) for tile in tiles)
+    )
+
+    extracted_text = "\n".join(text for text, _ in tile_results if text)
     confidence = 0.95 if extracted_text else 0.0
 
     return extracted_text, confidence
 
 
+async def process_uploaded_image(
+    image_content: bytes, segmented: bool
+) -> tuple[str, float]:
+    # Guard clause: check for empty upload
+    if not image_content:
+        raise HTTPException(
+            status_code=400,
+            detail="Empty file uploaded",
+        )
+
+    # Guard clause: check the JPEG magic bytes instead of decoding the image
+    if not has_jpeg_signature(image_content):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file content. File is not a valid JPEG image",
+        )
+
+    # Extract text via Vision API, tile by tile when segmented OCR is requested
+    if segmented:
+        return await extract_text_from_tiles(image_content)
+
+    return await extract_text_from_image(image_content)
+
+
+# --- Middleware ---
+
+
+class ContentLengthLimitMiddleware:
+    # Plain ASGI middleware rather than @app.middleware("http"): it only
+    # inspects the request headers, so it avoids BaseHTTPMiddleware's
+    # per-request task group and streams on every endpoint
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Reject on the declared Content-Length before the body is received,
+        # so oversized uploads are never parsed or spooled to disk. Chunked
+        # uploads without a Content-Length are still capped by the readers.
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name != b"content-length":
+                    continue
+                if value.isdigit() and int(value) > MAX_REQUEST_SIZE:
+                    response = payload_too_large_response()
+                    await response(scope, receive, send)
+                    return
+                break
+
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(ContentLengthLimitMiddleware)
+
+
 # --- Endpoints ---
 
 
-@app.get("/", response_model=ApiInfoModel)
-async def root() -> ApiInfoModel:
-    return ApiInfoModel(
+# The API info payload never changes, so it is serialized once at import
+_ROOT_RESPONSE_BYTES = orjson.dumps(
+    ApiInfoModel(
         service="OCR Text Extraction API",
         status="running",
         version="1.0.0",
         endpoints={
             "extract_text": "/extract-text (POST)",
+            "extract_text_raw": "/extract-text-raw (POST)",
             "health": "/health (GET)",
         },
-    )
+    ).model_dump()
+)
+
+
+@app.get("/", response_model=None, responses={200: {"model": ApiInfoModel}})
+async def root() -> Response:
+    return Response(content=_ROOT_RESPONSE_BYTES, media_type="application/json")
 
 
-@app.get("/health", response_model=HealthResponseModel)
+@app.get(
+    "/health",
+    response_model=None,
+    responses={200: {"model": HealthResponseModel}},
+)
 async def health() -> HealthResponseModel:
     vision_status = "healthy" if vision_client is not None else "unavailable"
-    return HealthResponseModel(
+    return HealthResponseModel.model_construct(
         status="healthy",
         vision_api=vision_status,
         timestamp=time.time(),
     )
 
 
-@app.post("/extract-text", response_model=SuccessResponseModel)
+# response_model=None skips FastAPI's re-validation of the already-typed
+# result; the model is still published in the OpenAPI schema via responses
+@app.post(
+    "/extract-text",
+    response_model=None,
+    responses={200: {"model": SuccessResponseModel}},
+)
 async def extract_text(
     image: UploadFile = File(...),
+    segmented: bool = False,
 ) -> SuccessResponseModel:
-    start_time = time.time()
+    start_time_ns = time.monotonic_ns()
 
     # Guard clause: validate format and extension
     validate_image(image)
 
-    # Read file content
-    image_content = await image.read()
+    # Read file content, rejecting oversized uploads while streaming
+    image_content = await read_upload(image)
 
-    # Guard clause: check file size
     file_size = len(image_content)
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail="File too large. Maximum size is 10MB",
-        )
+    extracted_text, confidence = await process_uploaded_image(
+        image_content, segmented
+    )
+
+    processing_time_ms = (time.monotonic_ns() - start_time_ns) // 1_000_000
+
+    logger.info(f"Successfully processed {image.filename}")
+    return SuccessResponseModel.model_construct(
+        success=True,
+        text=extracted_text,
+        confidence=confidence,
+        processing_time_ms=processing_time_ms,
+        metadata=MetadataModel.model_construct(
+            filename=image.filename,
+            file_size_bytes=file_size,
+            content_type=image.content_type,
+        ),
+    )
+
+
+# Accepts the JPEG as the raw request body (Content-Type: image/jpeg), which
+# skips multipart parsing entirely
+@app.post(
+    "/extract-text-raw",
+    response_model=None,
+    responses={200: {"model": SuccessResponseModel}},
+)
+async def extract_text_raw(
+    request: Request,
+    segmented: bool = False,
+) -> SuccessResponseModel:
+    start_time_ns = time.monotonic_ns()
 
-    if file_size == 0:
+    # Guard clause: validate the body's content type
+    content_type = request.headers.get("content-type", "")
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(
-            status_code=400,
-            detail="Empty file uploaded",
+            status_code=415,
+            detail=(
+                f"Invalid content type. Only JPG/JPEG images are supported. "
+                f"Received: {content_type or None}"
+            ),
         )
 
-    # Extract text via Vision API
-    extracted_text, confidence = extract_text_from_image(image_content)
+    # Read the body, rejecting oversized uploads while streaming
+    async with _raw_body_read_semaphore:
+        image_content = await read_request_body(request)
 
-    processing_time_ms = int((time.time() - start_time) * 1000)
+    file_size = len(image_content)
+    extracted_text, confidence = await process_uploaded_image(
+        image_content, segmented
+    )
 
-    logger.info(f"Successfully processed {image.filename}")
-    return SuccessResponseModel(
+    processing_time_ms = (time.monotonic_ns() - start_time_ns) // 1_000_000
+
+    logger.info("Successfully processed raw upload")
+    return SuccessResponseModel.model_construct(
         success=True,
         text=extracted_text,
         confidence=confidence,
         processing_time_ms=processing_time_ms,
-        metadata=MetadataModel(
-            filename=image.filename,
+        metadata=MetadataModel.model_construct(
+            filename=None,
             file_size_bytes=file_size,
-            content_type=image.content_type,
+            content_type=media_type,
         ),
     )
 
@@ -228,17 +809,8 @@ async def extract_text(
 
 
 @app.exception_handler(413)
-async def payload_too_large_handler(request, exc) -> JSONResponse:
-    error_response = ErrorResponseModel(
-        success=False,
-        error="Payload too large",
-        detail="File size exceeds 10MB limit",
-        processing_time_ms=0,
-    )
-    return JSONResponse(
-        status_code=413,
-        content=error_response.model_dump(),
-    )
+async def payload_too_large_handler(request, exc) -> Response:
+    return payload_too_large_response()
 
 
 # --- Entry Point ---
@@ -246,4 +818,16 @@ async def payload_too_large_handler(request, exc) -> JSONResponse:
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # uvloop and httptools ship with uvicorn[standard]; multiple workers
+    # require the app to be passed as an import string
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8080,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+        limit_concurrency=SERVER_LIMIT_CONCURRENCY,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEP_ALIVE_SECONDS,
+    )
@@ -1,5 +1,6 @@
+import asyncio
 import io
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -8,9 +9,10 @@ from fastapi.testclient import TestClient
 def _create_jpeg_bytes() -> bytes:
     """Create minimal valid JPEG bytes for testing."""
     try:
-        from PIL import Image
+        from PIL import Image, ImageDraw
 
         img = Image.new("RGB", (100, 100), color="white")
+        ImageDraw.Draw(img).text((10, 10), "Hello World", fill="black")
         buf = io.BytesIO()
         img.save(buf, format="JPEG")
         return buf.getvalue()
@@ -36,12 +38,21 @@ def _patch_vision(monkeypatch):
     mock_response = MagicMock()
     mock_response.error.message = ""
     mock_response.text_annotations = [annotation]
-    mock_client.text_detection.return_value = mock_response
+    mock_client.text_detection = AsyncMock(return_value=mock_response)
 
     with patch("main.vision_client", mock_client):
         yield mock_client
 
 
+@pytest.fixture(autouse=True)
+def _clear_ocr_cache():
+    from main import _OCR_CACHE
+
+    _OCR_CACHE.clear()
+    yield
+    _OCR_CACHE.clear()
+
+
 @pytest.fixture()
 def client():
     from main import app
@@ -96,6 +107,12 @@ def test_extract_text_jpeg_extension(client):
     assert response.json()["success"] is True
 
 
+def test_extract_text_uppercase_extension(client):
+    files = {"image": ("PHOTO.JPG", SAMPLE_JPEG, "image/jpeg")}
+    response = client.post("/extract-text", files=files)
+    assert response.status_code == 200
+
+
 # --- Extract Text: Invalid Format ---
 
 
@@ -113,6 +130,14 @@ def test_extract_text_invalid_extension(client):
     assert "Invalid file extension" in response.json()["detail"]
 
 
+def test_extract_text_invalid_jpeg_signature(client, _patch_vision):
+    files = {"image": ("test.jpg", b"\x89PNG\r\n\x1a\n", "image/jpeg")}
+    response = client.post("/extract-text", files=files)
+    assert response.status_code == 400
+    assert "not a valid JPEG" in response.json()["detail"]
+    _patch_vision.text_detection.assert_not_called()
+
+
 def test_extract_text_no_filename(client):
     files = {"image": ("", SAMPLE_JPEG, "image/jpeg")}
     response = client.post("/extract-text", files=files)
@@ -137,6 +162,36 @@ def test_extract_text_file_too_large(client):
     assert response.status_code == 413
 
 
+def test_read_upload_measures_file_without_recorded_size():
+    from fastapi import HTTPException, UploadFile
+
+    from main import MAX_FILE_SIZE, read_upload
+
+    small = UploadFile(file=io.BytesIO(SAMPLE_JPEG))
+    assert asyncio.run(read_upload(small)) == SAMPLE_JPEG
+
+    large = UploadFile(file=io.BytesIO(b"\xff" * (MAX_FILE_SIZE + 1)))
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(read_upload(large))
+    assert exc_info.value.status_code == 413
+
+
+def test_extract_text_rejects_large_content_length(client, _patch_vision):
+    response = client.post(
+        "/extract-text",
+        content=b"",
+        headers={
+            "content-type": "multipart/form-data; boundary=x",
+            "content-length": str(20 * 1024 * 1024),
+        },
+    )
+    assert response.status_code == 413
+    data = response.json()
+    assert data["success"] is False
+    assert data["error"] == "Payload too large"
+    _patch_vision.text_detection.assert_not_called()
+
+
 # --- Extract Text: No Text Found ---
 
 
@@ -155,6 +210,290 @@ def test_extract_text_no_text_found(client, _patch_vision):
     assert data["confidence"] == 0.0
 
 
+def test_extract_text_blank_image_skips_vision(client, _patch_vision):
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (100, 100), color="white").save(buf, format="JPEG")
+
+    files = {"image": ("blank.jpg", buf.getvalue(), "image/jpeg")}
+    response = client.post("/extract-text", files=files)
+    assert response.status_code == 200
+    assert response.json()["text"] == ""
+    assert response.json()["confidence"] == 0.0
+    _patch_vision.text_detection.assert_not_called()
+
+
+# --- Extract Text: Segmented OCR ---
+
+
+def test_extract_text_segmented_reuses_cached_tiles(client, _patch_vision):
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (1024, 512), color="white")
+    draw = ImageDraw.Draw(img)
+    draw.text((10, 10), "Left", fill="black")
+    draw.text((522, 10), "Right", fill="black")
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG")
+
+    files = {"image": ("page.jpg", buf.getvalue(), "image/jpeg")}
+    with patch("main.record_text_screen") as record_text_screen:
+        first = client.post("/extract-text?segmented=true", files=files)
+    assert first.status_code == 200
+    assert first.json()["text"] == "Hello World\nHello World"
+    assert _patch_vision.text_detection.call_count == 2
+    record_text_screen.assert_not_called()
+
+    second = client.post("/extract-text?segmented=true", files=files)
+    assert second.json()["text"] == first.json()["text"]
+    assert _patch_vision.text_detection.call_count == 2
+
+
+# --- Extract Text: Result Cache ---
+
+
+def test_extract_text_repeated_image_uses_cache(client, _patch_vision):
+    files = {"image": ("test.jpg", SAMPLE_JPEG, "image/jpeg")}
+    first = client.post("/extract-text", files=files)
+    second = client.post("/extract-text", files=files)
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json()["text"] == first.json()["text"]
+    assert _patch_vision.text_detection.call_count == 1
+
+
+def test_ocr_cache_is_keyed_by_image_content():
+    from main import get_cached_text, get_ocr_cache_key, store_cached_text
+
+    store_cached_text(get_ocr_cache_key(b"attacker"), ("evil", 0.95))
+    assert get_cached_text(get_ocr_cache_key(b"victim")) is None
+    assert get_cached_text(get_ocr_cache_key(b"attacker")) == ("evil", 0.95)
+
+
+def test_ocr_cache_expires_negative_results_sooner():
+    import time
+
+    from main import (
+        OCR_CACHE_NEGATIVE_TTL_SECONDS,
+        get_cached_text,
+        store_cached_text,
+    )
+
+    now = time.monotonic()
+    store_cached_text(b"blank-key", ("", 0.0))
+    store_cached_text(b"text-key", ("Hello", 0.95))
+
+    later = now + OCR_CACHE_NEGATIVE_TTL_SECONDS + 1
+    with patch("main.time.monotonic", return_value=later):
+        assert get_cached_text(b"blank-key") is None
+        assert get_cached_text(b"text-key") == ("Hello", 0.95)
+
+
+# --- Image Downscaling ---
+
+
+def test_preprocess_image_downscales_large_jpeg():
+    from PIL import Image, ImageDraw
+
+    import main
+
+    img = Image.new("RGB", (4000, 3000), color="white")
+    ImageDraw.Draw(img).rectangle(
+        (1000, 1000, 3000, 2000), outline="black", width=20
+    )
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=100)
+
+    with patch("main.PILImage.open", wraps=Image.open) as open_image:
+        _, result, payload = main.preprocess_image(buf.getvalue())
+    assert open_image.call_count == 1
+
+    assert result is None
+    width, height = Image.open(io.BytesIO(payload)).size
+    assert max(width, height) <= main.MAX_IMAGE_DIMENSION
+    assert width / height == pytest.approx(4000 / 3000, rel=0.01)
+
+
+def test_preprocess_image_keeps_small_jpeg():
+    from main import preprocess_image
+
+    assert preprocess_image(SAMPLE_JPEG)[1:] == (None, SAMPLE_JPEG)
+
+
+def test_preprocess_image_passes_through_undecodable_bytes():
+    from main import preprocess_image
+
+    content = b"\xff\xd8\xffnot really a jpeg"
+    assert preprocess_image(content)[1:] == (None, content)
+
+
+def _create_decompression_bomb_bytes() -> bytes:
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), color="white").save(buf, format="JPEG")
+    content = bytearray(buf.getvalue())
+
+    # Rewrite the SOF0 header to claim a 65000x65000 image
+    sof = content.index(b"\xff\xc0")
+    content[sof + 5 : sof + 9] = (65000).to_bytes(2, "big") * 2
+    return bytes(content)
+
+
+def test_extract_text_decompression_bomb_is_handled(client, _patch_vision):
+    files = {
+        "image": ("bomb.jpg", _create_decompression_bomb_bytes(), "image/jpeg")
+    }
+    response = client.post("/extract-text", files=files)
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+    response = client.post("/extract-text?segmented=true", files=files)
+    assert response.status_code == 200
+
+
+# --- Vision Client Pool ---
+
+
+def test_get_vision_client_round_robins_pool():
+    from main import get_vision_client
+
+    pool = [MagicMock(), MagicMock()]
+    with patch("main.vision_client_pool", pool):
+        picked = [get_vision_client() for _ in range(4)]
+    assert picked.count(pool[0]) == 2
+    assert picked.count(pool[1]) == 2
+
+
+# --- Vision Request Batching ---
+
+
+def test_vision_batcher_coalesces_concurrent_requests(_patch_vision):
+    import main
+
+    batch_response = MagicMock()
+    batch_response.responses = [MagicMock(), MagicMock(), MagicMock()]
+    _patch_vision.batch_annotate_images = AsyncMock(return_value=batch_response)
+
+    async def annotate_concurrently() -> list:
+        queue = asyncio.Queue()
+        worker = asyncio.create_task(main.run_vision_batcher(queue))
+        with patch("main._vision_batch_queue", queue):
+            results = await asyncio.gather(
+                *(main.annotate_image(p) for p in (b"a", b"b", b"c"))
+            )
+        worker.cancel()
+        return results
+
+    results = asyncio.run(annotate_concurrently())
+    assert results == batch_response.responses
+    _patch_vision.batch_annotate_images.assert_awaited_once()
+    requests = _patch_vision.batch_annotate_images.call_args.kwargs["requests"]
+    assert [r.image.content for r in requests] == [b"a", b"b", b"c"]
+    _patch_vision.text_detection.assert_not_called()
+
+
+# --- Extract Text Raw ---
+
+
+def test_extract_text_raw_valid_jpg(client):
+    response = client.post(
+        "/extract-text-raw",
+        content=SAMPLE_JPEG,
+        headers={"content-type": "image/jpeg"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["text"] == "Hello World"
+    assert data["metadata"]["filename"] is None
+    assert data["metadata"]["file_size_bytes"] == len(SAMPLE_JPEG)
+
+
+def test_extract_text_raw_invalid_content_type(client):
+    response = client.post(
+        "/extract-text-raw",
+        content=b"fakepng",
+        headers={"content-type": "image/png"},
+    )
+    assert response.status_code == 415
+
+
+def test_extract_text_raw_empty_body(client):
+    response = client.post(
+        "/extract-text-raw",
+        content=b"",
+        headers={"content-type": "image/jpeg"},
+    )
+    assert response.status_code == 400
+    assert "Empty file" in response.json()["detail"]
+
+
+def test_vision_batcher_fails_undispatched_requests_on_cancel():
+    from fastapi import HTTPException
+
+    import main
+
+    async def cancel_mid_batch() -> asyncio.Future:
+        queue = asyncio.Queue()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((b"a", future))
+        worker = asyncio.create_task(main.run_vision_batcher(queue))
+        await asyncio.sleep(0)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        return future
+
+    future = asyncio.run(cancel_mid_batch())
+    assert isinstance(future.exception(), HTTPException)
+    assert future.exception().status_code == 503
+
+
+def _lifespan_client(batch_responses: list) -> MagicMock:
+    mock_client = MagicMock()
+    batch_response = MagicMock()
+    batch_response.responses = batch_responses
+    mock_client.batch_annotate_images = AsyncMock(return_value=batch_response)
+    mock_client.transport.close = AsyncMock()
+    return mock_client
+
+
+def test_extract_text_batched_through_lifespan(_patch_vision):
+    from main import app
+
+    annotation = MagicMock()
+    annotation.description = "Batched"
+    image_response = MagicMock()
+    image_response.error.message = ""
+    image_response.text_annotations = [annotation]
+    mock_client = _lifespan_client([image_response])
+
+    files = {"image": ("test.jpg", SAMPLE_JPEG, "image/jpeg")}
+    with patch("main.create_vision_client", return_value=mock_client):
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.post("/extract-text", files=files)
+
+    assert response.status_code == 200
+    assert response.json()["text"] == "Batched"
+    mock_client.batch_annotate_images.assert_awaited_once()
+    mock_client.text_detection.assert_not_called()
+    mock_client.transport.close.assert_awaited()
+
+
+def test_extract_text_batch_missing_response_fails(_patch_vision):
+    from main import app
+
+    mock_client = _lifespan_client([])
+
+    files = {"image": ("test.jpg", SAMPLE_JPEG, "image/jpeg")}
+    with patch("main.create_vision_client", return_value=mock_client):
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.post("/extract-text", files=files)
+
+    assert response.status_code == 500
+
+
 # --- Extract Text: Vision API Errors ---
 
 